@@ -14,6 +14,7 @@ import seaborn as sns
 from sklearn.cluster import KMeans
 from sklearn.preprocessing import StandardScaler
 from sklearn.decomposition import PCA
+from figuras import datos_categorias, renderizar_figuras
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -66,19 +67,15 @@ def analisis_cohortes(df):
         print("Tendencias mensuales de conversión:")
         print(monthly_cohorts.sort_values('contact_month'))
         
-        # Visualización de cohortes
-        plt.figure(figsize=(12, 6))
-        plt.plot(monthly_cohorts['contact_month'], monthly_cohorts['mean'], 
-                marker='o', linewidth=2, markersize=8)
-        plt.title('Tasa de Conversión por Mes', fontsize=16, fontweight='bold')
-        plt.xlabel('Mes', fontsize=12)
-        plt.ylabel('Tasa de Conversión', fontsize=12)
-        plt.grid(True, alpha=0.3)
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.savefig('../figures/cohortes_temporales.png', dpi=300, bbox_inches='tight')
-        plt.close()
-        print("Gráfico de cohortes guardado")
+        # Visualización de cohortes (se omite si los datos no han cambiado)
+        cohortes_plot = monthly_cohorts.set_index('contact_month')['mean']
+        renderizar_figuras({
+            'cohortes_temporales.png': {
+                'tipo': 'linea', 'figsize': [12, 6],
+                'titulo': 'Tasa de Conversión por Mes', 'xlabel': 'Mes', 'ylabel': 'Tasa de Conversión',
+                'datos': datos_categorias(cohortes_plot)
+            }
+        })
         
         return monthly_cohorts
     
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark del Servicio de Datos Compartidos - Marketing Bancario
+Autor: Bernardo Novelo Rotger
+Fecha: 28/08/2025
+Descripción: Compara memoria y latencia al aumentar el número de sesiones
+concurrentes, entre el modo clásico (cada sesión lee el CSV y filtra con copias)
+y el almacén compartido mapeado en memoria (filtros por índices).
+"""
+
+import multiprocessing as mp
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from servicio_datos import DATA_PATH, DIRECTORIO_ALMACEN, AlmacenDatos, preparar_almacen
+
+# Configuración del benchmark
+SESIONES = [1, 5, 10, 20]
+REPETICIONES = 20
+FILTROS = [
+    ('Todos', 18, 95),
+    ('cellular', 25, 35),
+    ('telephone', 40, 60),
+    ('Todos', 30, 50),
+]
+
+
+def memoria_proceso_mb():
+    """
+    Memoria del proceso actual en MB.
+
+    En Linux usa PSS (las páginas compartidas se reparten entre los procesos
+    que las usan, de modo que la suma entre sesiones es la memoria real).
+    Si no está disponible, usa USS de psutil; si tampoco, devuelve NaN.
+    """
+    try:
+        with open('/proc/self/smaps_rollup', 'r') as f:
+            for linea in f:
+                if linea.startswith('Pss:'):
+                    return int(linea.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_full_info().uss / (1024 * 1024)
+    except (ImportError, AttributeError):
+        return float('nan')
+
+
+def _sesion_csv(barrera, cola):
+    """Sesión clásica: lee el CSV y filtra con copias de DataFrame"""
+    inicio = time.perf_counter()
+    df = pd.read_csv(DATA_PATH)
+    conexion = time.perf_counter() - inicio
+
+    latencias = []
+    for i in range(REPETICIONES):
+        contact, edad_min, edad_max = FILTROS[i % len(FILTROS)]
+        t0 = time.perf_counter()
+        if contact != 'Todos':
+            filtered_df = df[(df['contact'] == contact) & (df['age'] >= edad_min) & (df['age'] <= edad_max)]
+        else:
+            filtered_df = df[(df['age'] >= edad_min) & (df['age'] <= edad_max)]
+        filtered_df['y'].mean()
+        filtered_df.groupby('contact')['y'].agg(['mean', 'count'])
+        filtered_df.groupby('campaign')['y'].agg(['mean', 'count'])
+        np.histogram(filtered_df['age'].dropna(), bins=30)
+        latencias.append(time.perf_counter() - t0)
+
+    # Mantener vivo el último filtrado mientras se mide, como una sesión abierta
+    barrera.wait()
+    cola.put((conexion, latencias, memoria_proceso_mb()))
+    barrera.wait()
+    del filtered_df
+
+
+def _sesion_compartida(barrera, cola):
+    """Sesión sobre el almacén compartido: filtros por índices, sin copias"""
+    inicio = time.perf_counter()
+    almacen = AlmacenDatos(DIRECTORIO_ALMACEN)
+    conexion = time.perf_counter() - inicio
+
+    latencias = []
+    for i in range(REPETICIONES):
+        contact, edad_min, edad_max = FILTROS[i % len(FILTROS)]
+        t0 = time.perf_counter()
+        filtered_idx = almacen.filtrar(contact=contact, edad_min=edad_min, edad_max=edad_max)
+        almacen.metricas(filtered_idx)
+        almacen.tasa_por_grupo('contact', filtered_idx)
+        almacen.tasa_por_grupo('campaign', filtered_idx)
+        almacen.histograma('age', filtered_idx, bins=30)
+        latencias.append(time.perf_counter() - t0)
+
+    barrera.wait()
+    cola.put((conexion, latencias, memoria_proceso_mb()))
+    barrera.wait()
+    del filtered_idx
+
+
+def ejecutar_escenario(modo, n_sesiones):
+    """Lanza n_sesiones procesos concurrentes y agrega sus mediciones"""
+    objetivo = _sesion_csv if modo == 'csv' else _sesion_compartida
+    barrera = mp.Barrier(n_sesiones)
+    cola = mp.Queue()
+    procesos = [mp.Process(target=objetivo, args=(barrera, cola)) for _ in range(n_sesiones)]
+
+    for p in procesos:
+        p.start()
+    resultados = [cola.get() for _ in procesos]
+    for p in procesos:
+        p.join()
+
+    conexiones = [r[0] for r in resultados]
+    latencias = np.concatenate([r[1] for r in resultados]) * 1000
+    memoria = [r[2] for r in resultados]
+    return {
+        'modo': modo,
+        'sesiones': n_sesiones,
+        'memoria_total_mb': round(float(np.sum(memoria)), 1),
+        'memoria_por_sesion_mb': round(float(np.mean(memoria)), 1),
+        'conexion_media_ms': round(float(np.mean(conexiones)) * 1000, 1),
+        'latencia_p50_ms': round(float(np.percentile(latencias, 50)), 2),
+        'latencia_p95_ms': round(float(np.percentile(latencias, 95)), 2)
+    }
+
+
+def main():
+    """Ejecuta el benchmark completo y muestra la tabla de resultados"""
+    print("Benchmark del Servicio de Datos Compartidos")
+    print("=" * 60)
+
+    try:
+        preparar_almacen()
+        sesiones = [int(n) for n in sys.argv[1:]] or SESIONES
+
+        resultados = []
+        for n_sesiones in sesiones:
+            for modo in ['csv', 'compartido']:
+                print(f"Ejecutando {n_sesiones} sesiones en modo {modo}...")
+                resultados.append(ejecutar_escenario(modo, n_sesiones))
+
+        tabla = pd.DataFrame(resultados)
+        print("\nResultados:")
+        print(tabla.to_string(index=False))
+
+        ruta = os.path.join(os.path.dirname(DATA_PATH), 'benchmark_servicio.csv')
+        tabla.to_csv(ruta, index=False)
+        print(f"\nResultados guardados en {ruta}")
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+
+
+if __name__ == "__main__":
+    main()
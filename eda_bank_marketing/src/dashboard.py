@@ -8,12 +8,13 @@ Descripción: Aplicación web interactiva para explorar resultados del EDA
 """
 
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import numpy as np
+import os
 from pathlib import Path
 
+from servicio_datos import DATA_PATH, DIRECTORIO_ALMACEN, MANIFIESTO, conectar
+
 # Configuración de la página
 st.set_page_config(
     page_title="Dashboard Marketing Bancario",
@@ -27,74 +28,63 @@ st.title("Dashboard de Análisis de Marketing Bancario")
 st.markdown("---")
 
 # Cargar datos
-@st.cache_data
+@st.cache_resource
 def load_data():
-    """Carga los datos procesados"""
+    """Se conecta al almacén de datos compartido (mapeado en memoria)"""
     try:
-        # Obtener la ruta absoluta del directorio del script
-        import os
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        # Subir un nivel para llegar a la raíz del proyecto
-        project_dir = os.path.dirname(script_dir)
-        # Construir la ruta al archivo de datos
-        data_path = os.path.join(project_dir, 'data', 'processed', 'bank_customers_merged.csv')
-        
-        # Verificar si el archivo existe
-        if not os.path.exists(data_path):
-            st.error(f"No se encontró el archivo de datos en: {data_path}")
+        # El almacén se comparte entre sesiones y procesos: no se copia por usuario
+        if not os.path.exists(DATA_PATH) and not os.path.exists(
+                os.path.join(DIRECTORIO_ALMACEN, MANIFIESTO)):
+            st.error(f"No se encontró el archivo de datos en: {DATA_PATH}")
             return None
-            
-        # Cargar dataset unificado
-        merged_df = pd.read_csv(data_path)
-        return merged_df
+        
+        return conectar()
     except Exception as e:
         st.error(f"Error al cargar los datos: {str(e)}")
         st.error("Asegúrate de haber ejecutado primero el análisis (python eda.py)")
         return None
 
 # Cargar datos
-df = load_data()
+almacen = load_data()
 
-if df is not None:
+if almacen is not None:
     # Sidebar para filtros
     st.sidebar.header("Filtros")
     
     # Filtro por canal de contacto
-    contact_options = ['Todos'] + list(df['contact'].unique())
+    contact_options = ['Todos'] + almacen.valores_unicos('contact')
     selected_contact = st.sidebar.selectbox("Canal de Contacto", contact_options)
     
     # Filtro por rango de edad
+    edad_min, edad_max = almacen.rango('age')
     age_range = st.sidebar.slider("Rango de Edad", 
-                                 int(df['age'].min()), 
-                                 int(df['age'].max()), 
-                                 (int(df['age'].min()), int(df['age'].max())))
-    
-    # Aplicar filtros
-    if selected_contact != 'Todos':
-        filtered_df = df[(df['contact'] == selected_contact) & 
-                        (df['age'] >= age_range[0]) & 
-                        (df['age'] <= age_range[1])]
-    else:
-        filtered_df = df[(df['age'] >= age_range[0]) & 
-                        (df['age'] <= age_range[1])]
+                                 int(edad_min), 
+                                 int(edad_max), 
+                                 (int(edad_min), int(edad_max)))
+    
+    # Aplicar filtros (índices sobre el almacén compartido, sin copiar filas)
+    filtered_idx = almacen.filtrar(contact=selected_contact,
+                                   edad_min=age_range[0],
+                                   edad_max=age_range[1])
+    metricas = almacen.metricas(filtered_idx)
     
     # Métricas principales
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        total_contacts = len(filtered_df)
+        total_contacts = metricas['total_contactos']
         st.metric("Total Contactos", f"{total_contacts:,}")
     
     with col2:
-        conversion_rate = filtered_df['y'].mean() * 100
+        conversion_rate = metricas['tasa_conversion'] * 100
         st.metric("Tasa Conversión", f"{conversion_rate:.2f}%")
     
     with col3:
-        avg_age = filtered_df['age'].mean()
+        avg_age = metricas['edad_promedio']
         st.metric("Edad Promedio", f"{avg_age:.1f} años")
     
     with col4:
-        avg_campaign = filtered_df['campaign'].mean()
+        avg_campaign = metricas['campana_promedio']
         st.metric("Promedio Campaña", f"{avg_campaign:.1f} contactos")
     
     st.markdown("---")
@@ -104,15 +94,16 @@ if df is not None:
     
     with col1:
         st.subheader("Distribución de Edad")
-        fig_age = px.histogram(filtered_df, x='age', nbins=30, 
-                              title="Distribución de Edad de Clientes",
-                              color_discrete_sequence=['#1f77b4'])
-        fig_age.update_layout(showlegend=False)
+        age_hist = almacen.histograma('age', filtered_idx, bins=30)
+        fig_age = px.bar(age_hist, x='centro', y='count',
+                         title="Distribución de Edad de Clientes",
+                         color_discrete_sequence=['#1f77b4'])
+        fig_age.update_layout(showlegend=False, bargap=0, xaxis_title="age")
         st.plotly_chart(fig_age, use_container_width=True)
     
     with col2:
         st.subheader("Conversión por Canal")
-        conversion_by_contact = filtered_df.groupby('contact')['y'].agg(['mean', 'count']).reset_index()
+        conversion_by_contact = almacen.tasa_por_grupo('contact', filtered_idx)
         fig_contact = px.bar(conversion_by_contact, x='contact', y='mean',
                             title="Tasa de Conversión por Canal",
                             color_discrete_sequence=['#ff7f0e'])
@@ -121,8 +112,7 @@ if df is not None:
     
     # Análisis de correlación
     st.subheader("Matriz de Correlación")
-    numeric_cols = filtered_df.select_dtypes(include=[np.number]).columns
-    correlation_matrix = filtered_df[numeric_cols].corr()
+    correlation_matrix = almacen.correlacion(filtered_idx)
     
     fig_corr = px.imshow(correlation_matrix,
                          title="Matriz de Correlación de Variables Numéricas",
@@ -135,7 +125,7 @@ if df is not None:
     
     with col1:
         st.subheader("Conversión por Ocupación")
-        conversion_by_job = filtered_df.groupby('job')['y'].agg(['mean', 'count']).reset_index()
+        conversion_by_job = almacen.tasa_por_grupo('job', filtered_idx)
         conversion_by_job = conversion_by_job[conversion_by_job['count'] >= 100]  # Filtrar por frecuencia
         conversion_by_job = conversion_by_job.sort_values('mean', ascending=False)
         
@@ -147,7 +137,7 @@ if df is not None:
     
     with col2:
         st.subheader("Conversión vs Número de Contactos")
-        conversion_by_campaign = filtered_df.groupby('campaign')['y'].agg(['mean', 'count']).reset_index()
+        conversion_by_campaign = almacen.tasa_por_grupo('campaign', filtered_idx)
         conversion_by_campaign = conversion_by_campaign[conversion_by_campaign['count'] >= 5]
         
         fig_campaign = px.scatter(conversion_by_campaign, x='campaign', y='mean', 
@@ -160,9 +150,9 @@ if df is not None:
     # Análisis temporal
     st.subheader("Análisis Temporal")
     
-    if 'contact_month' in filtered_df.columns:
-        monthly_conversion = filtered_df.groupby('contact_month')['y'].mean().reset_index()
-        fig_monthly = px.line(monthly_conversion, x='contact_month', y='y',
+    if 'contact_month' in almacen:
+        monthly_conversion = almacen.tasa_por_grupo('contact_month', filtered_idx)
+        fig_monthly = px.line(monthly_conversion, x='contact_month', y='mean',
                              title="Tasa de Conversión por Mes",
                              color_discrete_sequence=['#9467bd'])
         fig_monthly.update_layout(yaxis_title="Tasa de Conversión")
@@ -170,16 +160,17 @@ if df is not None:
     
     # Tabla de datos filtrados
     st.subheader("Datos Filtrados")
-    st.dataframe(filtered_df.head(100), use_container_width=True)
-    
-    # Descarga de datos filtrados
-    csv = filtered_df.to_csv(index=False)
-    st.download_button(
-        label="Descargar Datos Filtrados (CSV)",
-        data=csv,
-        file_name=f'marketing_bancario_filtrado_{selected_contact}_{age_range[0]}-{age_range[1]}.csv',
-        mime='text/csv'
-    )
+    st.dataframe(almacen.a_dataframe(filtered_idx, limite=100), use_container_width=True)
+    
+    # Descarga de datos filtrados (solo se materializa la copia si se solicita)
+    if st.button("Preparar Descarga (CSV)"):
+        csv = almacen.a_dataframe(filtered_idx).to_csv(index=False)
+        st.download_button(
+            label="Descargar Datos Filtrados (CSV)",
+            data=csv,
+            file_name=f'marketing_bancario_filtrado_{selected_contact}_{age_range[0]}-{age_range[1]}.csv',
+            mime='text/csv'
+        )
 
 else:
     st.error("""
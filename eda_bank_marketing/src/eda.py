@@ -16,6 +16,8 @@ import warnings
 import os
 import sys
 
+from figuras import ESTILO_EDA, datos_histograma, datos_categorias, datos_matriz, renderizar_figuras
+
 # Configuración de visualización
 plt.style.use('seaborn-v0_8')
 sns.set_palette("husl")
@@ -148,82 +150,70 @@ def generar_estadisticas_descriptivas(df):
     
     return stats_basicas
 
-def generar_visualizaciones(df):
-    """Genera todas las visualizaciones requeridas"""
-    print("Generando visualizaciones...")
-    
-    # Configurar estilo
-    plt.style.use('seaborn-v0_8')
-    sns.set_palette("husl")
+def calcular_datos_visualizaciones(df):
+    """Calcula los datos agregados de cada visualización (sin dibujar)"""
+    specs = {}
     
     # 1. Distribución de edad
     if 'age' in df.columns:
-        plt.figure(figsize=(10, 6))
-        plt.hist(df['age'].dropna(), bins=30, alpha=0.7, color='skyblue', edgecolor='black')
-        plt.title('Distribución de Edad de Clientes', fontsize=16, fontweight='bold')
-        plt.xlabel('Edad', fontsize=12)
-        plt.ylabel('Frecuencia', fontsize=12)
-        plt.grid(True, alpha=0.3)
-        plt.savefig('../figures/age_distribution.png', dpi=300, bbox_inches='tight')
-        plt.close()
-        print("age_distribution.png generado")
+        specs['age_distribution.png'] = {
+            'tipo': 'histograma', 'estilo': ESTILO_EDA, 'figsize': [10, 6], 'color': 'skyblue',
+            'titulo': 'Distribución de Edad de Clientes', 'xlabel': 'Edad', 'ylabel': 'Frecuencia',
+            'datos': datos_histograma(df['age'], bins=30)
+        }
     
     # 2. Distribución de contactos de campaña
     if 'campaign' in df.columns:
-        plt.figure(figsize=(10, 6))
-        plt.hist(df['campaign'].dropna(), bins=20, alpha=0.7, color='lightgreen', edgecolor='black')
-        plt.title('Distribución de Número de Contactos por Campaña', fontsize=16, fontweight='bold')
-        plt.xlabel('Número de Contactos', fontsize=12)
-        plt.ylabel('Frecuencia', fontsize=12)
-        plt.grid(True, alpha=0.3)
-        plt.savefig('../figures/campaign_contacts_distribution.png', dpi=300, bbox_inches='tight')
-        plt.close()
-        print("campaign_contacts_distribution.png generado")
+        specs['campaign_contacts_distribution.png'] = {
+            'tipo': 'histograma', 'estilo': ESTILO_EDA, 'figsize': [10, 6], 'color': 'lightgreen',
+            'titulo': 'Distribución de Número de Contactos por Campaña',
+            'xlabel': 'Número de Contactos', 'ylabel': 'Frecuencia',
+            'datos': datos_histograma(df['campaign'], bins=20)
+        }
     
     # 3. Tasa de conversión por canal de contacto
     if 'contact' in df.columns and 'y' in df.columns:
         conversion_data = df.groupby('contact')['y'].mean().sort_values(ascending=False)
-        plt.figure(figsize=(10, 6))
-        conversion_data.plot(kind='bar', color='coral', alpha=0.7)
-        plt.title('Tasa de Conversión por Canal de Contacto', fontsize=16, fontweight='bold')
-        plt.xlabel('Canal de Contacto', fontsize=12)
-        plt.ylabel('Tasa de Conversión', fontsize=12)
-        plt.xticks(rotation=45)
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
-        plt.savefig('../figures/conversion_by_contact.png', dpi=300, bbox_inches='tight')
-        plt.close()
-        print("conversion_by_contact.png generado")
+        specs['conversion_by_contact.png'] = {
+            'tipo': 'barras', 'estilo': ESTILO_EDA, 'figsize': [10, 6], 'color': 'coral',
+            'titulo': 'Tasa de Conversión por Canal de Contacto',
+            'xlabel': 'Canal de Contacto', 'ylabel': 'Tasa de Conversión',
+            'datos': datos_categorias(conversion_data)
+        }
     
     # 4. Heatmap de correlaciones
     numeric_cols = df.select_dtypes(include=[np.number]).columns
     if len(numeric_cols) > 1:
         correlation_matrix = df[numeric_cols].corr()
-        plt.figure(figsize=(12, 10))
-        sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', center=0, 
-                   square=True, linewidths=0.5, cbar_kws={"shrink": .8})
-        plt.title('Matriz de Correlación de Variables Numéricas', fontsize=16, fontweight='bold')
-        plt.tight_layout()
-        plt.savefig('../figures/correlation_heatmap.png', dpi=300, bbox_inches='tight')
-        plt.close()
-        print("correlation_heatmap.png generado")
+        specs['correlation_heatmap.png'] = {
+            'tipo': 'heatmap', 'estilo': ESTILO_EDA, 'figsize': [12, 10], 'grid': False,
+            'titulo': 'Matriz de Correlación de Variables Numéricas',
+            'datos': datos_matriz(correlation_matrix)
+        }
     
     # 5. Tasa de conversión vs número de contactos
     if 'campaign' in df.columns and 'y' in df.columns:
         conversion_by_campaign = df.groupby('campaign')['y'].agg(['mean', 'count']).reset_index()
         conversion_by_campaign = conversion_by_campaign[conversion_by_campaign['count'] >= 5]  # Filtrar por frecuencia
-        
-        plt.figure(figsize=(10, 6))
-        plt.scatter(conversion_by_campaign['campaign'], conversion_by_campaign['mean'], 
-                   s=conversion_by_campaign['count']*2, alpha=0.7, color='purple')
-        plt.title('Tasa de Conversión vs Número de Contactos', fontsize=16, fontweight='bold')
-        plt.xlabel('Número de Contactos', fontsize=12)
-        plt.ylabel('Tasa de Conversión', fontsize=12)
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
-        plt.savefig('../figures/conversion_vs_contacts.png', dpi=300, bbox_inches='tight')
-        plt.close()
-        print("conversion_vs_contacts.png generado")
+        specs['conversion_vs_contacts.png'] = {
+            'tipo': 'dispersion', 'estilo': ESTILO_EDA, 'figsize': [10, 6], 'color': 'purple',
+            'titulo': 'Tasa de Conversión vs Número de Contactos',
+            'xlabel': 'Número de Contactos', 'ylabel': 'Tasa de Conversión',
+            'datos': {
+                'x': conversion_by_campaign['campaign'].tolist(),
+                'y': conversion_by_campaign['mean'].tolist(),
+                'conteos': conversion_by_campaign['count'].tolist()
+            }
+        }
+    
+    return specs
+
+def generar_visualizaciones(df, forzar=False):
+    """Genera todas las visualizaciones requeridas (solo las que han cambiado)"""
+    print("Generando visualizaciones...")
+    
+    specs = calcular_datos_visualizaciones(df)
+    return renderizar_figuras(specs, forzar=forzar)
 
 def guardar_datos_procesados(bank_clean, customers_clean, merged_df):
     """Guarda los datasets procesados"""
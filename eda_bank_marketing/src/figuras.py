@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Generación de Figuras con Caché - Marketing Bancario
+Autor: Bernardo Novelo Rotger
+Fecha: 28/08/2025
+Descripción: Separa el cálculo de los datos de cada gráfico (conteos de histograma,
+tasas agrupadas) de su renderizado. Cada figura se identifica por un hash de sus
+datos agregados y su estilo, y solo se vuelve a dibujar cuando ese hash cambia.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+import seaborn as sns
+
+# Configuración de salida
+FIGURES_DIR = '../figures'
+CACHE_FILE = os.path.join(FIGURES_DIR, '.figuras_cache.json')
+DPI = 300
+
+# Versión del renderizador: incrementarla invalida todas las figuras cacheadas
+VERSION_RENDER = 1
+
+# Estilo usado por las figuras del EDA
+ESTILO_EDA = {'mpl': 'seaborn-v0_8', 'paleta': 'husl', 'rc': {'font.size': 12}}
+
+
+def _a_lista(valores):
+    """Convierte un array o serie a lista de tipos nativos de Python"""
+    return [v.item() if hasattr(v, 'item') else v for v in valores]
+
+
+def datos_histograma(serie, bins):
+    """Calcula los conteos y bordes de un histograma sobre los valores no nulos"""
+    valores = pd.to_numeric(serie, errors='coerce').dropna().to_numpy()
+    conteos, bordes = np.histogram(valores, bins=bins)
+    return {'conteos': _a_lista(conteos), 'bordes': _a_lista(bordes)}
+
+
+def datos_categorias(serie):
+    """Convierte una serie agregada (índice -> valor) en etiquetas y valores"""
+    return {'etiquetas': [str(e) for e in serie.index], 'valores': _a_lista(serie.to_numpy())}
+
+
+def datos_matriz(matriz):
+    """Convierte una matriz cuadrada (p. ej. de correlación) a listas"""
+    return {
+        'columnas': [str(c) for c in matriz.columns],
+        'valores': [_a_lista(fila) for fila in matriz.to_numpy()]
+    }
+
+
+def calcular_hash(spec):
+    """Calcula el hash de los datos y el estilo de una figura"""
+    contenido = json.dumps({'version': VERSION_RENDER, 'spec': spec}, sort_keys=True)
+    return hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+
+
+def cargar_cache():
+    """Carga el registro de figuras generadas (hash y datos agregados)"""
+    if not os.path.exists(CACHE_FILE):
+        return {}
+    try:
+        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def guardar_cache(cache):
+    """Guarda el registro de figuras generadas"""
+    tmp_file = CACHE_FILE + '.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, sort_keys=True)
+    os.replace(tmp_file, CACHE_FILE)
+
+
+def _dibujar_histograma(spec):
+    datos = spec['datos']
+    bordes = datos['bordes']
+    plt.hist(bordes[:-1], bins=bordes, weights=datos['conteos'],
+             alpha=0.7, color=spec['color'], edgecolor='black')
+
+
+def _dibujar_barras(spec):
+    datos = spec['datos']
+    pd.Series(datos['valores'], index=datos['etiquetas']).plot(
+        kind='bar', color=spec['color'], alpha=0.7)
+    plt.xticks(rotation=45)
+
+
+def _dibujar_heatmap(spec):
+    datos = spec['datos']
+    matriz = pd.DataFrame(datos['valores'], index=datos['columnas'], columns=datos['columnas'])
+    sns.heatmap(matriz, annot=True, cmap='coolwarm', center=0,
+                square=True, linewidths=0.5, cbar_kws={"shrink": .8})
+
+
+def _dibujar_dispersion(spec):
+    datos = spec['datos']
+    tamanos = [c * 2 for c in datos['conteos']]
+    plt.scatter(datos['x'], datos['y'], s=tamanos, alpha=0.7, color=spec['color'])
+
+
+def _dibujar_linea(spec):
+    datos = spec['datos']
+    plt.plot(datos['etiquetas'], datos['valores'], marker='o', linewidth=2, markersize=8)
+    plt.xticks(rotation=45)
+
+
+RENDERIZADORES = {
+    'histograma': _dibujar_histograma,
+    'barras': _dibujar_barras,
+    'heatmap': _dibujar_heatmap,
+    'dispersion': _dibujar_dispersion,
+    'linea': _dibujar_linea,
+}
+
+
+def renderizar_figura(nombre_archivo, spec):
+    """Dibuja una figura a partir de sus datos agregados y la guarda en disco"""
+    estilo = spec.get('estilo') or {'mpl': 'default'}
+    with plt.style.context([estilo['mpl'], estilo.get('rc', {})]):
+        if 'paleta' in estilo:
+            sns.set_palette(estilo['paleta'])
+
+        plt.figure(figsize=tuple(spec['figsize']))
+        RENDERIZADORES[spec['tipo']](spec)
+        plt.title(spec['titulo'], fontsize=16, fontweight='bold')
+        if spec.get('xlabel'):
+            plt.xlabel(spec['xlabel'], fontsize=12)
+        if spec.get('ylabel'):
+            plt.ylabel(spec['ylabel'], fontsize=12)
+        if spec.get('grid', True):
+            plt.grid(True, alpha=0.3)
+        plt.tight_layout()
+        plt.savefig(os.path.join(FIGURES_DIR, nombre_archivo), dpi=DPI, bbox_inches='tight')
+        plt.close()
+
+
+def renderizar_figuras(specs, forzar=False):
+    """
+    Renderiza solo las figuras cuyos datos o estilo han cambiado.
+
+    `specs` es un diccionario nombre_archivo -> especificación (tipo, datos
+    agregados y estilo). Devuelve la lista de figuras que se han dibujado.
+    """
+    os.makedirs(FIGURES_DIR, exist_ok=True)
+    cache = cargar_cache()
+    generadas = []
+
+    for nombre_archivo, spec in specs.items():
+        hash_spec = calcular_hash(spec)
+        ruta = os.path.join(FIGURES_DIR, nombre_archivo)
+        registro = cache.get(nombre_archivo, {})
+
+        if not forzar and registro.get('hash') == hash_spec and os.path.exists(ruta):
+            print(f"{nombre_archivo} sin cambios (omitido)")
+            continue
+
+        renderizar_figura(nombre_archivo, spec)
+        cache[nombre_archivo] = {'hash': hash_spec, 'spec': spec}
+        generadas.append(nombre_archivo)
+        print(f"{nombre_archivo} generado")
+
+    guardar_cache(cache)
+    return generadas
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Servicio de Datos Compartidos - Marketing Bancario
+Autor: Bernardo Novelo Rotger
+Fecha: 28/08/2025
+Descripción: Carga el dataset procesado una sola vez en un almacén columnar de
+ficheros .npy mapeados en memoria. Cada sesión del dashboard (o cualquier otro
+proceso) se conecta sin copiar los datos: el sistema operativo comparte las
+páginas entre procesos, y los filtros devuelven índices en lugar de DataFrames.
+Incluye una pequeña API HTTP local para consultar métricas y agregados.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Rutas del proyecto (relativas a este script, igual que en el dashboard)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(SCRIPT_DIR)
+DATA_PATH = os.path.join(PROJECT_DIR, 'data', 'processed', 'bank_customers_merged.csv')
+DIRECTORIO_ALMACEN = os.path.join(PROJECT_DIR, 'data', 'processed', 'almacen')
+MANIFIESTO = 'manifiesto.json'
+BLOQUEO = '.bloqueo'
+
+# Versión del formato del almacén: incrementarla fuerza una reconstrucción
+FORMATO_ALMACEN = 2
+
+# Configuración del servicio HTTP
+HOST = '127.0.0.1'
+PUERTO = 8765
+
+
+def _fuente_firma(data_path):
+    """Firma del CSV de origen (tamaño y fecha de modificación)"""
+    stat = os.stat(data_path)
+    return {'ruta': os.path.abspath(data_path), 'tamano': stat.st_size, 'mtime': stat.st_mtime}
+
+
+def _leer_manifiesto(directorio):
+    """Lee el manifiesto publicado, o None si no existe o es de otro formato"""
+    try:
+        with open(os.path.join(directorio, MANIFIESTO), 'r', encoding='utf-8') as f:
+            manifiesto = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifiesto.get('formato') != FORMATO_ALMACEN:
+        return None
+    return manifiesto
+
+
+@contextmanager
+def _bloqueo(directorio):
+    """Bloqueo exclusivo entre procesos para reconstruir el almacén"""
+    with open(os.path.join(directorio, BLOQUEO), 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _guardar_npy(directorio, nombre, array):
+    """Guarda un array .npy dentro del directorio de la generación"""
+    with open(os.path.join(directorio, nombre), 'wb') as f:
+        np.save(f, array)
+    return nombre
+
+
+def _construir_generacion(df, directorio):
+    """Escribe todas las columnas de `df` en `directorio` y devuelve su descripción"""
+    columnas = {}
+    for i, col in enumerate(df.columns):
+        serie = df[col]
+        if pd.api.types.is_bool_dtype(serie):
+            columnas[col] = {'tipo': 'booleana', 'fichero': _guardar_npy(directorio, f'c{i}.npy', serie.to_numpy())}
+        elif pd.api.types.is_numeric_dtype(serie):
+            columnas[col] = {'tipo': 'numerica', 'fichero': _guardar_npy(directorio, f'c{i}.npy', serie.to_numpy())}
+        else:
+            codigos, categorias = pd.factorize(serie.astype('string'), sort=True)
+            categorias = np.asarray(categorias.astype(str), dtype=str)
+            columnas[col] = {
+                'tipo': 'categorica',
+                'fichero': _guardar_npy(directorio, f'c{i}_codigos.npy', codigos.astype(np.int32)),
+                'categorias': _guardar_npy(directorio, f'c{i}_categorias.npy', categorias)
+            }
+    return columnas
+
+
+def _limpiar_generaciones(directorio, actual):
+    """Elimina las generaciones antiguas y los restos de construcciones fallidas"""
+    for nombre in os.listdir(directorio):
+        ruta = os.path.join(directorio, nombre)
+        if nombre == actual:
+            continue
+        if os.path.isdir(ruta):
+            # En Windows los ficheros aún mapeados no se pueden borrar: se reintenta en la próxima reconstrucción
+            shutil.rmtree(ruta, ignore_errors=True)
+        elif nombre.endswith('.npy') or '.tmp' in nombre:
+            # Ficheros del formato anterior (sin generaciones) o temporales huérfanos
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+
+
+def preparar_almacen(data_path=DATA_PATH, directorio=DIRECTORIO_ALMACEN, forzar=False):
+    """
+    Convierte el CSV procesado en un almacén columnar mapeable en memoria.
+
+    Las columnas numéricas se guardan tal cual; las de texto como códigos
+    enteros más un array de categorías de ancho fijo. Solo se reconstruye
+    si el CSV de origen ha cambiado.
+
+    Cada reconstrucción se escribe en su propio subdirectorio (una
+    "generación") y se publica sustituyendo el manifiesto de forma atómica,
+    de modo que un proceso nunca mezcla ficheros de dos generaciones. Las
+    reconstrucciones concurrentes se serializan con un fichero de bloqueo.
+    """
+    os.makedirs(directorio, exist_ok=True)
+    firma = _fuente_firma(data_path)
+
+    manifiesto = _leer_manifiesto(directorio)
+    if not forzar and manifiesto is not None and manifiesto['fuente'] == firma:
+        print("Almacén de datos actualizado (sin cambios)")
+        return manifiesto
+
+    with _bloqueo(directorio):
+        # Otro proceso puede haber reconstruido mientras se esperaba el bloqueo
+        manifiesto = _leer_manifiesto(directorio)
+        if not forzar and manifiesto is not None and manifiesto['fuente'] == firma:
+            print("Almacén de datos actualizado (sin cambios)")
+            return manifiesto
+
+        print("Preparando almacén de datos compartido...")
+        df = pd.read_csv(data_path)
+
+        contenido = json.dumps({'formato': FORMATO_ALMACEN, 'fuente': firma}, sort_keys=True)
+        generacion = hashlib.sha256(contenido.encode('utf-8')).hexdigest()[:16]
+        if manifiesto is not None and manifiesto['generacion'] == generacion:
+            # Reconstrucción forzada de la generación publicada: usar un nombre nuevo
+            generacion = f"{generacion}-{os.getpid()}"
+        ruta_generacion = os.path.join(directorio, generacion)
+
+        tmp_generacion = f"{ruta_generacion}.tmp.{os.getpid()}"
+        shutil.rmtree(tmp_generacion, ignore_errors=True)
+        os.makedirs(tmp_generacion)
+        columnas = _construir_generacion(df, tmp_generacion)
+        shutil.rmtree(ruta_generacion, ignore_errors=True)
+        os.rename(tmp_generacion, ruta_generacion)
+
+        manifiesto = {
+            'formato': FORMATO_ALMACEN,
+            'fuente': firma,
+            'generacion': generacion,
+            'n_filas': len(df),
+            'orden': list(df.columns),
+            'columnas': columnas
+        }
+        ruta_manifiesto = os.path.join(directorio, MANIFIESTO)
+        tmp = f"{ruta_manifiesto}.tmp.{os.getpid()}"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(manifiesto, f, ensure_ascii=False)
+        os.replace(tmp, ruta_manifiesto)
+
+        _limpiar_generaciones(directorio, generacion)
+
+    print(f"Almacén preparado: {len(df)} filas x {len(columnas)} columnas")
+    return manifiesto
+
+
+class AlmacenDatos:
+    """
+    Vista de solo lectura sobre el almacén mapeado en memoria.
+
+    Abrir el almacén no lee los datos: cada columna es un `np.memmap` cuyas
+    páginas comparten todos los procesos conectados. Los filtros devuelven
+    arrays de índices y los agregados solo materializan las columnas que usan.
+    """
+
+    def __init__(self, directorio=DIRECTORIO_ALMACEN):
+        try:
+            self._abrir(directorio)
+        except FileNotFoundError:
+            # La generación leída se acaba de sustituir y borrar: releer el manifiesto
+            self._abrir(directorio)
+
+    def _abrir(self, directorio):
+        self.manifiesto = _leer_manifiesto(directorio)
+        if self.manifiesto is None:
+            raise FileNotFoundError(f"No hay un almacén de datos publicado en: {directorio}")
+        ruta_generacion = os.path.join(directorio, self.manifiesto['generacion'])
+        self.n_filas = self.manifiesto['n_filas']
+        self.columnas = {}
+        self.categorias = {}
+        for col, info in self.manifiesto['columnas'].items():
+            self.columnas[col] = np.load(os.path.join(ruta_generacion, info['fichero']), mmap_mode='r')
+            if info['tipo'] == 'categorica':
+                self.categorias[col] = np.load(os.path.join(ruta_generacion, info['categorias']), mmap_mode='r')
+
+    def __contains__(self, col):
+        return col in self.columnas
+
+    def es_categorica(self, col):
+        return col in self.categorias
+
+    def numericas(self):
+        """Nombres de las columnas numéricas (sin booleanas, como `select_dtypes(include=[np.number])`)"""
+        return [col for col in self.manifiesto['orden']
+                if self.manifiesto['columnas'][col]['tipo'] == 'numerica']
+
+    def valores_unicos(self, col):
+        """Categorías de una columna de texto"""
+        return [str(c) for c in self.categorias[col]]
+
+    def rango(self, col):
+        """Mínimo y máximo de una columna numérica"""
+        valores = self.columnas[col]
+        return float(np.nanmin(valores)), float(np.nanmax(valores))
+
+    def filtrar(self, contact=None, edad_min=None, edad_max=None):
+        """Devuelve los índices de las filas que cumplen los filtros"""
+        mascara = np.ones(self.n_filas, dtype=bool)
+        if contact is not None and contact != 'Todos':
+            categorias = self.valores_unicos('contact')
+            codigo = categorias.index(contact) if contact in categorias else -2
+            mascara &= self.columnas['contact'] == codigo
+        if edad_min is not None:
+            mascara &= self.columnas['age'] >= edad_min
+        if edad_max is not None:
+            mascara &= self.columnas['age'] <= edad_max
+        return np.flatnonzero(mascara)
+
+    def media(self, col, indices):
+        """Media de una columna numérica sobre las filas seleccionadas"""
+        valores = self.columnas[col][indices]
+        if len(valores) == 0 or np.all(np.isnan(valores.astype(float))):
+            return float('nan')
+        return float(np.nanmean(valores))
+
+    def metricas(self, indices):
+        """Métricas principales del dashboard"""
+        return {
+            'total_contactos': int(len(indices)),
+            'tasa_conversion': self.media('y', indices),
+            'edad_promedio': self.media('age', indices),
+            'campana_promedio': self.media('campaign', indices)
+        }
+
+    def histograma(self, col, indices, bins=30):
+        """Conteos y bordes del histograma de una columna numérica"""
+        if self.es_categorica(col):
+            raise ValueError(f"La columna '{col}' no es numérica")
+        valores = self.columnas[col][indices].astype(float)
+        valores = valores[~np.isnan(valores)]
+        conteos, bordes = np.histogram(valores, bins=bins)
+        return pd.DataFrame({
+            'desde': bordes[:-1],
+            'hasta': bordes[1:],
+            'centro': (bordes[:-1] + bordes[1:]) / 2,
+            'count': conteos
+        })
+
+    def tasa_por_grupo(self, col, indices, objetivo='y'):
+        """
+        Media y conteo de `objetivo` agrupando por `col`, equivalente a
+        `df.groupby(col)[objetivo].agg(['mean', 'count']).reset_index()`.
+        """
+        y = self.columnas[objetivo][indices].astype(float)
+        claves = self.columnas[col][indices]
+
+        if self.es_categorica(col):
+            validos = (claves >= 0) & ~np.isnan(y)
+            etiquetas = np.asarray(self.categorias[col])
+            codigos = claves[validos]
+        else:
+            claves = claves.astype(float)
+            validos = ~np.isnan(claves) & ~np.isnan(y)
+            etiquetas, codigos = np.unique(claves[validos], return_inverse=True)
+
+        conteos = np.bincount(codigos, minlength=len(etiquetas))
+        sumas = np.bincount(codigos, weights=y[validos], minlength=len(etiquetas))
+        observados = conteos > 0
+        resultado = pd.DataFrame({
+            col: etiquetas[observados],
+            'mean': sumas[observados] / conteos[observados],
+            'count': conteos[observados]
+        })
+        if not self.es_categorica(col) and np.all(np.mod(resultado[col], 1) == 0):
+            resultado[col] = resultado[col].astype(int)
+        return resultado
+
+    def correlacion(self, indices):
+        """Matriz de correlación de las columnas numéricas seleccionadas"""
+        return pd.DataFrame({col: self.columnas[col][indices] for col in self.numericas()}).corr()
+
+    def a_dataframe(self, indices, limite=None):
+        """Materializa las filas seleccionadas como DataFrame (copia explícita)"""
+        if limite is not None:
+            indices = indices[:limite]
+        datos = {}
+        for col in self.manifiesto['orden']:
+            valores = self.columnas[col][indices]
+            if self.es_categorica(col):
+                categorias = np.append(np.asarray(self.categorias[col], dtype=object), None)
+                valores = categorias[valores]
+            datos[col] = valores
+        return pd.DataFrame(datos)
+
+
+def _a_json(valor):
+    """Convierte resultados (DataFrames, NaN, tipos numpy) a JSON válido"""
+    if isinstance(valor, pd.DataFrame):
+        return [_a_json(fila) for fila in valor.to_dict(orient='records')]
+    if isinstance(valor, dict):
+        return {k: _a_json(v) for k, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [_a_json(v) for v in valor]
+    if isinstance(valor, np.generic):
+        valor = valor.item()
+    if isinstance(valor, float) and np.isnan(valor):
+        return None
+    return valor
+
+
+def crear_servidor(almacen, host=HOST, puerto=PUERTO):
+    """
+    Crea el servidor HTTP local. Endpoints (GET, respuesta JSON):
+
+    - /info: filas, columnas, canales de contacto y rango de edad
+    - /metricas: métricas principales
+    - /histograma?columna=age&bins=30
+    - /conversion?columna=contact
+
+    Todos salvo /info aceptan los filtros contact, edad_min y edad_max.
+    """
+
+    class Manejador(BaseHTTPRequestHandler):
+
+        def _responder(self, codigo, cuerpo):
+            datos = json.dumps(_a_json(cuerpo), ensure_ascii=False).encode('utf-8')
+            self.send_response(codigo)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(datos)))
+            self.end_headers()
+            self.wfile.write(datos)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            try:
+                if url.path == '/info':
+                    self._responder(200, {
+                        'n_filas': almacen.n_filas,
+                        'columnas': almacen.manifiesto['orden'],
+                        'contact': almacen.valores_unicos('contact'),
+                        'age': almacen.rango('age')
+                    })
+                    return
+
+                indices = almacen.filtrar(
+                    contact=params.get('contact'),
+                    edad_min=float(params['edad_min']) if 'edad_min' in params else None,
+                    edad_max=float(params['edad_max']) if 'edad_max' in params else None
+                )
+                if url.path == '/metricas':
+                    self._responder(200, almacen.metricas(indices))
+                elif url.path == '/histograma':
+                    self._responder(200, almacen.histograma(params.get('columna', 'age'), indices,
+                                                            bins=int(params.get('bins', 30))))
+                elif url.path == '/conversion':
+                    self._responder(200, almacen.tasa_por_grupo(params.get('columna', 'contact'), indices))
+                else:
+                    self._responder(404, {'error': f"Ruta no encontrada: {url.path}"})
+            except (KeyError, ValueError) as e:
+                self._responder(400, {'error': str(e)})
+
+        def log_message(self, format, *args):
+            pass
+
+    return ThreadingHTTPServer((host, puerto), Manejador)
+
+
+def conectar(data_path=DATA_PATH, directorio=DIRECTORIO_ALMACEN):
+    """Prepara el almacén si falta o el CSV ha cambiado, y se conecta a él"""
+    if os.path.exists(data_path):
+        preparar_almacen(data_path, directorio)
+    return AlmacenDatos(directorio)
+
+
+def main():
+    """Prepara el almacén y arranca el servicio HTTP local"""
+    print("Iniciando Servicio de Datos Compartidos - Marketing Bancario")
+    print("=" * 60)
+
+    try:
+        preparar_almacen(forzar='--forzar' in sys.argv)
+        almacen = AlmacenDatos()
+        servidor = crear_servidor(almacen)
+        print(f"Servicio escuchando en http://{HOST}:{PUERTO}")
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\nServicio detenido")
+    except Exception as e:
+        print(f"Error: {str(e)}")
+
+
+if __name__ == "__main__":
+    main()